@@ -2,17 +2,6 @@ import os
 import sys
 import ctypes
 import platform
-import pandas as pd
-import warnings
-
-# ================= 强力静音区 =================
-# 1. 关闭 CoW 警告
-pd.options.mode.copy_on_write = False
-# 2. 关闭赋值警告
-pd.options.mode.chained_assignment = None
-# 3. 过滤所有 FutureWarnings
-warnings.simplefilter(action='ignore', category=FutureWarning)
-# ============================================
 
 # =========================================================================
 # 1. 环境路径锚定 (防止相对路径错误)
@@ -39,14 +28,13 @@ def setup_environment():
         os.path.join(PROJECT_ROOT, "logs")  # 预留给系统日志
     ]
 
-    for d in required_dirs:
-        if not os.path.exists(d):
-            try:
-                os.makedirs(d, exist_ok=True)
-                print(f"    [+] 创建目录: {d}")
-            except Exception as e:
-                print(f"    [!] 创建目录失败 {d}: {e}")
-                sys.exit(1)
+    # exist_ok=True 已处理 "目录已存在"，无需先 exists 再 makedirs 两次 stat
+    try:
+        for d in required_dirs:
+            os.makedirs(d, exist_ok=True)
+    except Exception as e:
+        print(f"    [!] 创建目录失败 {d}: {e}")
+        sys.exit(1)
 
     # Windows 高分屏 (High-DPI) 适配
     # 让字体和图标在缩放设置下不模糊
@@ -64,7 +52,20 @@ def run_gui():
     """
     try:
         # 延迟导入，确保环境 setup 之后再加载依赖
+        # (pandas 链条约 300ms 冷启动开销，只有 GUI 路径才需要付)
         import customtkinter as ctk
+        import pandas as pd
+        import warnings
+
+        # ================= 强力静音区 =================
+        # 1. 关闭 CoW 警告
+        pd.options.mode.copy_on_write = False
+        # 2. 关闭赋值警告
+        pd.options.mode.chained_assignment = None
+        # 3. 过滤所有 FutureWarnings
+        warnings.simplefilter(action='ignore', category=FutureWarning)
+        # ============================================
+
         from src.ui.app import App
 
         print(">>> 启动图形界面 (GUI)...")
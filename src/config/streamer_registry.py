@@ -1,7 +1,24 @@
+import atexit
 import json
 import os
 import random
-from typing import Dict, Optional, List, TypedDict
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional, List, TypedDict, ValuesView
+
+# 可选加速: orjson 的 C 实现比标准库 json 快 3~5 倍，缺失时回退标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# [路径锚定] 模块加载时计算一次，实例化 StreamerRegistry 不再重复推导
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_CONFIG_ROOT = os.path.join(_PROJECT_ROOT, "config")
+_JSON_PATH = os.path.join(_CONFIG_ROOT, "streamers.json")
 
 
 # 定义主播配置的数据结构 (Type Hinting)
@@ -19,13 +36,22 @@ class StreamerRegistry:
     """
 
     def __init__(self):
-        # [路径锚定]
-        current_file_path = os.path.abspath(__file__)
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_file_path)))
-        self.config_root = os.path.join(project_root, "config")
-        self.json_path = os.path.join(self.config_root, "streamers.json")
-
-        self._cache: Dict[str, StreamerProfile] = {}
+        self.config_root = _CONFIG_ROOT
+        self.json_path = _JSON_PATH
+
+        # [SoA 列式存储] 按字段分列存放 (uid -> 值)
+        # 批量取 "所有名称/颜色" 时直接给出整列，StreamerProfile 只在 API 边界组装
+        self._names: Dict[str, str] = {}
+        self._colors: Dict[str, str] = {}
+        self._created: Dict[str, str] = {}
+
+        # [写盘去抖] 连续变更合并为一次落盘，程序退出时兜底 flush
+        self._dirty = False
+        self._batch_depth = 0
+        self._batch_timestamp: Optional[str] = None
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
 
         self._default_colors = [
             "#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4", "#FFEEAD",
@@ -49,14 +75,19 @@ class StreamerRegistry:
     def reload(self):
         """从磁盘重新加载配置 (兼容性增强版)"""
         try:
-            with open(self.json_path, 'r', encoding='utf-8') as f:
-                raw_data = json.load(f)
+            if orjson is not None:
+                with open(self.json_path, 'rb') as f:
+                    raw_data = orjson.loads(f.read())
+            else:
+                with open(self.json_path, 'r', encoding='utf-8') as f:
+                    raw_data = json.load(f)
 
             # [核心修复] 智能识别两种 JSON 结构
 
             # 情况 A: 标准格式 {"streamers": [ ... ]}
             if isinstance(raw_data, dict) and "streamers" in raw_data and isinstance(raw_data["streamers"], list):
-                self._cache = {s['uid']: s for s in raw_data["streamers"]}
+                # 单次遍历拆列，避免推导式对解码结果的二次扫描
+                self._load_profiles(raw_data["streamers"])
 
             # 情况 B: 意外保存为纯字典格式 { "uid": { ... } }
             elif isinstance(raw_data, dict) and "streamers" not in raw_data:
@@ -68,28 +99,88 @@ class StreamerRegistry:
                         break
 
                 if is_profile_dict:
-                    self._cache = raw_data
+                    self._load_profiles(raw_data.values())
                 else:
                     print("[Registry] 警告: 配置文件格式无法识别，已重置")
-                    self._cache = {}
+                    self._clear_cache()
 
             else:
-                self._cache = {}
+                self._clear_cache()
 
         except (json.JSONDecodeError, FileNotFoundError):
-            self._cache = {}
+            self._clear_cache()
+
+    def _load_profiles(self, profiles):
+        """内部逻辑: 将 profile 序列一次遍历拆进各列"""
+        names: Dict[str, str] = {}
+        colors: Dict[str, str] = {}
+        created: Dict[str, str] = {}
+        for s in profiles:
+            uid = s['uid']
+            names[uid] = s.get('name', f"主播_{uid}")
+            colors[uid] = s.get('color', self._pick_random_color(uid))
+            created[uid] = s.get('created_at', "")
+        self._names = names
+        self._colors = colors
+        self._created = created
+
+    def _clear_cache(self):
+        self._names = {}
+        self._colors = {}
+        self._created = {}
+
+    # 去抖间隔 (秒): 该窗口内的重复 save() 只产生一次磁盘写入
+    _FLUSH_DELAY = 0.5
 
     def save(self):
-        """持久化保存到磁盘 (统一保存为标准格式)"""
-        data = {
-            "streamers": list(self._cache.values())
-        }
+        """标记配置为脏并调度延迟落盘 (去抖合并，真正写盘见 flush)"""
+        self._dirty = True
+        if self._batch_depth > 0:
+            # batch 模式: 退出上下文时统一落盘
+            return
+        with self._flush_lock:
+            if self._flush_timer is None:
+                timer = threading.Timer(self._FLUSH_DELAY, self.flush)
+                timer.daemon = True
+                self._flush_timer = timer
+                timer.start()
+
+    def flush(self):
+        """立即将未保存的变更写入磁盘 (幂等，统一保存为标准格式)"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            data = {
+                "streamers": [self._make_profile(uid) for uid in self._names]
+            }
         self._save_file(data)
 
+    @contextmanager
+    def batch(self):
+        """批量变更上下文: with registry.batch(): ... 退出时只落盘一次"""
+        self._batch_depth += 1
+        if self._batch_timestamp is None:
+            self._batch_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._batch_timestamp = None
+                self.flush()
+
     def _save_file(self, data):
         try:
-            with open(self.json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+            if orjson is not None:
+                with open(self.json_path, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(self.json_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=4)
         except Exception as e:
             print(f"[Registry Error] 保存配置失败: {e}")
 
@@ -98,58 +189,77 @@ class StreamerRegistry:
     # =========================================================
 
     def get_streamer(self, uid: str) -> Optional[StreamerProfile]:
-        return self._cache.get(str(uid))
+        uid = str(uid)
+        if uid not in self._names:
+            return None
+        return self._make_profile(uid)
 
     def get_or_register(self, uid: str, name: str = None) -> StreamerProfile:
         uid = str(uid)
-        if uid in self._cache:
-            return self._cache[uid]
+        if uid in self._names:
+            return self._make_profile(uid)
         return self.register_new_streamer(uid, name)
 
     def register_new_streamer(self, uid: str, name: str = None) -> StreamerProfile:
         if not name:
             name = f"主播_{uid}"
 
-        new_profile: StreamerProfile = {
-            "name": name,
-            "uid": uid,
-            "color": self._pick_random_color(uid),
-            "created_at": self._get_current_timestamp()
-        }
+        self._names[uid] = name
+        self._colors[uid] = self._pick_random_color(uid)
+        self._created[uid] = self._get_current_timestamp()
 
-        self._cache[uid] = new_profile
         self.save()
-        return new_profile
+        return self._make_profile(uid)
 
     def update_streamer_info(self, uid: str, name: str = None, color: str = None):
         uid = str(uid)
-        if uid not in self._cache:
+        if uid not in self._names:
             return
 
         changed = False
         if name:
-            self._cache[uid]['name'] = name
+            self._names[uid] = name
             changed = True
         if color:
-            self._cache[uid]['color'] = color
+            self._colors[uid] = color
             changed = True
 
         if changed:
             self.save()
 
     def get_all_streamers(self) -> List[StreamerProfile]:
-        return list(self._cache.values())
+        return [self._make_profile(uid) for uid in self._names]
+
+    # ------ 批量列视图 (绘图/列表控件用，不逐条组装 dict) ------
+
+    def all_names(self) -> ValuesView[str]:
+        return self._names.values()
+
+    def all_colors(self) -> ValuesView[str]:
+        return self._colors.values()
 
     # =========================================================
     # 工具方法
     # =========================================================
 
+    def _make_profile(self, uid: str) -> StreamerProfile:
+        """内部逻辑: 在 API 边界将各列组装回 StreamerProfile"""
+        return {
+            "name": self._names[uid],
+            "uid": uid,
+            "color": self._colors[uid],
+            "created_at": self._created[uid]
+        }
+
     def _pick_random_color(self, uid: str) -> str:
-        hash_val = sum(ord(c) for c in uid)
+        # crc32 是单次 C 调用，且分布远好于逐字符求和 (求和时 "123" 与 "321" 撞色)
+        hash_val = zlib.crc32(uid.encode('utf-8'))
         return self._default_colors[hash_val % len(self._default_colors)]
 
     def _get_current_timestamp(self) -> str:
-        from datetime import datetime
+        # batch 模式下整批复用同一时间戳 (created_at 不需要毫秒级精度)
+        if self._batch_timestamp is not None:
+            return self._batch_timestamp
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 # 单例模式 (可选，方便全局调用)
@@ -1,6 +1,19 @@
 import os
 import re
-from typing import List, Dict, TypedDict, Union, Optional
+import stat as stat_module
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from operator import itemgetter
+from typing import Iterator, List, Dict, Tuple, TypedDict, Union, Optional
+
+# 可选加速: google-re2 在构造期编译为 DFA，匹配线性时间、无回溯，
+# 对海量文件名扫描明显快于标准库的 NFA 回溯引擎；缺失时回退 re
+try:
+    import re2 as _re2
+except ImportError:
+    _re2 = None
+
+__all__ = ["FileMeta", "FileScanner"]
 
 
 # 定义扫描结果的数据结构
@@ -23,15 +36,32 @@ class FileScanner:
     # 正则表达式配置
     # -------------------------------------------------------------
 
+    # 注意: 所有模式均配合 fullmatch 使用，隐式锚定首尾，无需 ^/$
+    # (fullmatch 比 match + 显式 $ 少走几条 NFA 指令)
+
     # Log 匹配模式: 123456_2025-05-01.log
     # Group 1: UID
     # Group 2,3,4: YYYY, MM, DD
-    LOG_PATTERN = re.compile(r'^(\d+)_(\d{4})-(\d{1,2})-(\d{1,2})\.log$', re.IGNORECASE)
+    LOG_PATTERN = re.compile(r'(\d+)_(\d{4})-(\d{1,2})-(\d{1,2})\.log', re.IGNORECASE)
 
     # CSV 匹配模式: 123456_2025-5.csv 或 123456_2025-05.csv
     # Group 1: UID
     # Group 2,3: YYYY, MM
-    CSV_PATTERN = re.compile(r'^(\d+)_(\d{4})-(\d{1,2})\.csv$', re.IGNORECASE)
+    CSV_PATTERN = re.compile(r'(\d+)_(\d{4})-(\d{1,2})\.csv', re.IGNORECASE)
+
+    # 融合匹配模式: 一次正则调用同时识别 Log 与 CSV (命名分组区分)
+    # l* 组对应 Log (luid/ly/lm/ld)，c* 组对应 CSV (cuid/cy/cm)
+    _COMBINED_SRC = (
+        r'(?P<luid>\d+)_(?P<ly>\d{4})-(?P<lm>\d{1,2})-(?P<ld>\d{1,2})\.log'
+        r'|(?P<cuid>\d+)_(?P<cy>\d{4})-(?P<cm>\d{1,2})\.csv'
+    )
+    if _re2 is not None:
+        _COMBINED_PATTERN = _re2.compile(_COMBINED_SRC, _re2.IGNORECASE)
+    else:
+        _COMBINED_PATTERN = re.compile(_COMBINED_SRC, re.IGNORECASE)
+
+    # 合法后缀集合: 一次 C 层字符串比较即可挡掉无关文件，不进正则引擎
+    _VALID_SUFFIXES = ('.log', '.csv')
 
     @classmethod
     def scan(cls, target_path: str) -> List[FileMeta]:
@@ -39,69 +69,154 @@ class FileScanner:
         主入口: 扫描目标路径 (支持文件或文件夹)
         返回有效的文件元数据列表。
         """
-        results: List[FileMeta] = []
+        results = list(cls._collect(target_path))
+
+        # 按文件名排序，保证处理顺序 (Log按日期先后)
+        # itemgetter 是 C 层取键，免去每元素一次 lambda 调度
+        results.sort(key=itemgetter('file_name'))
+        return results
+
+    @classmethod
+    def scan_grouped(cls, target_path: str) -> Dict[str, List[FileMeta]]:
+        """
+        主入口: 扫描并直接按 UID 分组
+        (与 scan + group_by_uid 等价，但边扫边分组，省去平铺列表的二次遍历)
+        """
+        grouped: Dict[str, List[FileMeta]] = defaultdict(list)
+        for meta in cls._collect(target_path):
+            grouped[meta['uid']].append(meta)
 
-        if not os.path.exists(target_path):
-            return []
+        # 组内仍按文件名排序，保证处理顺序 (Log按日期先后)
+        for file_list in grouped.values():
+            file_list.sort(key=itemgetter('file_name'))
+        return dict(grouped)
+
+    @classmethod
+    def _collect(cls, target_path: str) -> Iterator[FileMeta]:
+        """内部逻辑: 产出未排序的扫描结果 (scan / scan_grouped 共用)"""
+        # 单次 stat 判断路径类型 (代替 exists/isfile/isdir 三连)
+        try:
+            st = os.stat(target_path)
+        except OSError:
+            return
 
         # 情况 A: 传入的是单个文件 (通常是 CSV)
-        if os.path.isfile(target_path):
-            meta = cls._parse_file(target_path)
-            if meta:
-                results.append(meta)
+        if not stat_module.S_ISDIR(st.st_mode):
+            parsed = cls._match_name(os.path.basename(target_path))
+            if parsed:
+                yield cls._build_meta(target_path, st.st_size, parsed)
+            return
 
         # 情况 B: 传入的是目录 (通常是 Log 文件夹)
-        elif os.path.isdir(target_path):
-            # 递归遍历目录
-            for root, dirs, files in os.walk(target_path):
-                for file in files:
-                    full_path = os.path.join(root, file)
-                    meta = cls._parse_file(full_path)
-                    if meta:
-                        results.append(meta)
+        # 线程池按子目录扇出: 扫描是 I/O 密集型，readdir/stat 期间释放 GIL
+        with ThreadPoolExecutor(max_workers=cls._MAX_SCAN_WORKERS) as pool:
+            pending = {pool.submit(cls._scan_dir, target_path)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subdirs, metas = future.result()
+                    yield from metas
+                    for subdir in subdirs:
+                        pending.add(pool.submit(cls._scan_dir, subdir))
+
+    # 扫描线程数上限 (NVMe 上约 8 线程即接近线性加速)
+    _MAX_SCAN_WORKERS = min(32, (os.cpu_count() or 4) * 4)
 
-        # 按文件名排序，保证处理顺序 (Log按日期先后)
-        results.sort(key=lambda x: x['file_name'])
-        return results
+    @classmethod
+    def _scan_dir(cls, dir_path: str) -> Tuple[List[str], List[FileMeta]]:
+        """内部逻辑: 非递归扫描单个目录，返回 (子目录列表, 命中的元数据列表)"""
+        subdirs: List[str] = []
+        files: List[os.DirEntry] = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        else:
+                            files.append(entry)
+                    except OSError:
+                        continue
+        except OSError:
+            return subdirs, []
+
+        metas: List[FileMeta] = []
+        for entry, parsed in zip(files, cls._match_names([e.name for e in files])):
+            if parsed:
+                # 只有命中的文件才读取大小 (多数平台直接走目录项缓存)
+                metas.append(cls._build_meta(entry.path, entry.stat().st_size, parsed))
+        return subdirs, metas
 
     @classmethod
-    def _parse_file(cls, file_path: str) -> Optional[FileMeta]:
-        """内部逻辑: 解析单个文件名"""
-        filename = os.path.basename(file_path)
-        file_size = os.path.getsize(file_path)
-
-        # 1. 尝试匹配 Log
-        log_match = cls.LOG_PATTERN.match(filename)
-        if log_match:
-            uid, year, month, day = log_match.groups()
-            # 补零格式化: 2025-5-1 -> 2025-05-01
-            date_str = f"{year}-{int(month):02d}-{int(day):02d}"
-            return {
-                "file_path": file_path,
-                "file_name": filename,
-                "file_type": "log",
-                "uid": uid,
-                "date_str": date_str,
-                "file_size": file_size
-            }
-
-        # 2. 尝试匹配 CSV
-        csv_match = cls.CSV_PATTERN.match(filename)
-        if csv_match:
-            uid, year, month = csv_match.groups()
-            # 补零格式化: 2025-5 -> 2025-05
-            date_str = f"{year}-{int(month):02d}"
-            return {
-                "file_path": file_path,
-                "file_name": filename,
-                "file_type": "csv",
-                "uid": uid,
-                "date_str": date_str,
-                "file_size": file_size
-            }
-
-        # 3. 都不匹配 (如 .DS_Store, README.txt)
-        return None
+    def _match_name(cls, filename: str) -> Optional[Tuple[str, str, str]]:
+        """内部逻辑: 解析单个文件名，返回 (file_type, uid, date_str)"""
+        # 后缀快筛: .DS_Store、Thumbs.db、README.md 之类在这里就被挡掉
+        if filename[-4:].lower() not in cls._VALID_SUFFIXES:
+            return None
+
+        # 单次正则匹配 (Log 与 CSV 融合在同一个模式里)
+        m = cls._COMBINED_PATTERN.fullmatch(filename)
+        if m is None:
+            # 都不匹配 (如 .DS_Store, README.txt)
+            return None
+
+        if m.group('luid') is not None:
+            # Log 分支: 补零格式化 2025-5-1 -> 2025-05-01
+            date_str = f"{m.group('ly')}-{int(m.group('lm')):02d}-{int(m.group('ld')):02d}"
+            return "log", m.group('luid'), date_str
+
+        # CSV 分支: 补零格式化 2025-5 -> 2025-05
+        date_str = f"{m.group('cy')}-{int(m.group('cm')):02d}"
+        return "csv", m.group('cuid'), date_str
+
+    # 批量匹配阈值: 文件名数量达到该值后，逐个调用正则的解释开销
+    # 超过 pandas 向量化一次性处理的成本，切换到批量路径
+    _BATCH_THRESHOLD = 512
+
+    @classmethod
+    def _match_names(cls, names: List[str]) -> List[Optional[Tuple[str, str, str]]]:
+        """内部逻辑: 批量解析文件名 (大列表走 pandas 向量化正则，其余逐个匹配)"""
+        if len(names) >= cls._BATCH_THRESHOLD:
+            try:
+                import pandas as pd
+            except ImportError:
+                pd = None
+            if pd is not None:
+                # 后缀快筛: 只把候选文件名交给正则，无关文件直接留 None
+                parsed: List[Optional[Tuple[str, str, str]]] = [None] * len(names)
+                candidates = [i for i, n in enumerate(names)
+                              if n[-4:].lower() in cls._VALID_SUFFIXES]
+                if not candidates:
+                    return parsed
+
+                # Series.str.extract 在 C 层对整列跑一次正则；
+                # extract 是 search 语义，需补回显式锚定以等价于 fullmatch
+                df = pd.Series([names[i] for i in candidates]).str.extract(
+                    '^(?:' + cls._COMBINED_SRC + ')$',
+                    flags=re.IGNORECASE
+                )
+                for i, (luid, ly, lm, ld, cuid, cy, cm) in zip(
+                        candidates, df.itertuples(index=False, name=None)):
+                    if isinstance(luid, str):
+                        parsed[i] = ("log", luid, f"{ly}-{int(lm):02d}-{int(ld):02d}")
+                    elif isinstance(cuid, str):
+                        parsed[i] = ("csv", cuid, f"{cy}-{int(cm):02d}")
+                    # 全 NaN 行 = 未命中，保持 None
+                return parsed
+        return [cls._match_name(n) for n in names]
+
+    @staticmethod
+    def _build_meta(file_path: str, file_size: int, parsed: Tuple[str, str, str]) -> FileMeta:
+        """内部逻辑: 组装 FileMeta"""
+        file_type, uid, date_str = parsed
+        return {
+            "file_path": file_path,
+            "file_name": os.path.basename(file_path),
+            "file_type": file_type,
+            "uid": uid,
+            "date_str": date_str,
+            "file_size": file_size
+        }
 
     @staticmethod
     def group_by_uid(file_list: List[FileMeta]) -> Dict[str, List[FileMeta]]:
@@ -109,10 +224,7 @@ class FileScanner:
         辅助工具: 将扫描结果按 UID 分组
         (方便后续 Parser 批量处理同一个主播的文件)
         """
-        grouped = {}
+        grouped: Dict[str, List[FileMeta]] = defaultdict(list)
         for item in file_list:
-            uid = item['uid']
-            if uid not in grouped:
-                grouped[uid] = []
-            grouped[uid].append(item)
-        return grouped
\ No newline at end of file
+            grouped[item['uid']].append(item)
+        return dict(grouped)
\ No newline at end of file